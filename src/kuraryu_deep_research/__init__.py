@@ -1,6 +1,6 @@
 """Deep Research Agent - Main module."""
 
 from .agents import DeepResearchAgent
-from .config import Settings
+from .config import Settings, get_settings
 
-__all__ = ["DeepResearchAgent", "Settings"]
+__all__ = ["DeepResearchAgent", "Settings", "get_settings"]
@@ -0,0 +1,89 @@
+"""Prompt templates for Deep Research Agent.
+
+Static instructions come first and per-run values last so that repeated
+calls share a byte-identical prefix for Anthropic prompt caching.
+"""
+
+ASSISTANT_SYSTEM = "あなたはResearch Assistantです。"
+QUERY_OPTIMIZER_SYSTEM = "あなたは検索クエリ最適化の専門家です。"
+EVALUATOR_SYSTEM = "あなたはResearch評価者です。"
+VERIFIER_SYSTEM = "あなたは情報検証の専門家です。"
+WRITER_SYSTEM = "あなたはResearch Writerです。"
+
+SUBQUERIES_TMPL = """以下の質問に包括的に答えるための、3-5個の具体的なSub Queryを生成してください。
+
+Research Query: "{query}"
+
+{target}"""
+
+GAPS_TARGET_TMPL = """不足している観点:
+{gaps}"""
+
+IMPROVE_QUERIES_TMPL = """以下の検索クエリは結果が少なかったです。
+各クエリを言い換えて、より検索結果が得られやすい形に改善してください。
+- 専門用語を一般的な言葉に
+- 英語のキーワードを追加
+- より広い概念に変更
+
+元のクエリ: "{query}"
+
+結果が少なかったクエリ:
+{queries}"""
+
+COVERAGE_TMPL = """収集した情報源で元のクエリに十分答えられるか評価してください。
+- 十分な場合: sufficient を true に
+- 不足がある場合: sufficient を false にし、不足している観点を gaps に列挙（最大3つ）
+
+収集した情報源:
+{sources}
+
+クエリ: "{query}\""""
+
+PAPER_SELECTION_TMPL = """以下の論文から、元のクエリを深く理解するために
+さらに調査すべき最も重要な論文を最大2つ選んでください。
+
+論文リスト:
+{papers}
+
+元のクエリ: 「{query}」"""
+
+VERIFY_TMPL = """以下の観点で収集した情報を検証してください:
+1. 矛盾する主張: 異なるソース間で矛盾する情報があれば指摘
+2. 信頼性評価: 学術論文(arxiv)は高信頼、一般Web記事は要注意
+3. 情報の鮮度: 古い情報と新しい情報の違いがあれば指摘
+
+検証レポートを簡潔に日本語で出力してください。矛盾がなければ「主要な矛盾は検出されませんでした」と記載。
+
+収集した情報:
+{sources}
+
+クエリ: "{query}\""""
+
+DIGEST_TMPL = """以下の各情報源から、元のクエリに関連する重要な事実を最大2つずつ簡潔に抽出してください。
+index には情報源の番号を指定してください。
+
+情報源:
+{sources}
+
+元のクエリ: "{query}\""""
+
+SOURCES_BLOCK_TMPL = """情報源:
+{evidence}"""
+
+OUTLINE_TMPL = """これらの情報源に基づいて、詳細な記事のアウトラインをセクションとサブセクションで作成してください。
+日本語で出力してください。
+
+クエリ: "{query}\""""
+
+ARTICLE_TMPL = """これらの情報源を使用して、以下のアウトラインに従って包括的なリサーチ記事を日本語で執筆してください。
+各主張の後に引用URL [source] を含めてください。
+矛盾する情報がある場合は両論併記してください。
+全て日本語で出力してください。
+
+アウトライン:
+{outline}{verification_note}"""
+
+VERIFICATION_NOTE_TMPL = """
+
+検証結果を考慮してください:
+{verification}"""
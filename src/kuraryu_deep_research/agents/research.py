@@ -1,17 +1,82 @@
 """Deep Research Agent implementation."""
 
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import replace
+from functools import cache, partial
+from typing import Any
+
 import boto3
+import tiktoken
 from botocore.config import Config
 from langchain_aws import ChatBedrock
+from langchain_core.caches import BaseCache
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import Runnable
 from langgraph.graph import END, StateGraph
 
+from ..cache import build_llm_cache
 from ..config import Settings
-from ..tools import SearchTools
-from .state import ResearchState
+from ..tools import SearchResult, SearchTools, normalize_query
+from . import prompts
+from .schemas import Coverage, ImprovedQueries, PaperSelection, SourceDigest, Subqueries
+from .state import ResearchState, ResultStore
 
 MAX_ITERATIONS = 3
 MAX_DEPTH = 2
+SEARCH_CONCURRENCY = 8
+PRIMARY_SOURCES = ("arxiv", "web", "kaggle-competition", "kaggle-dataset")
+RETRY_SOURCES = ("arxiv", "web")
+SUMMARY_BATCH_SIZE = 8
+COVERAGE_MIN_RESULTS = 6
+COVERAGE_MIN_SOURCES = 3
+BEDROCK_POOL_CONNECTIONS = 32
+SOURCE_RANK = {"arxiv": 0, "arxiv-deep": 0, "kaggle-competition": 1, "kaggle-dataset": 1, "web": 2}
+PROMPT_OVERHEAD_TOKENS = 2_000
+FALLBACK_BYTES_PER_TOKEN = 3  # errs high: one token per CJK character, three ASCII characters per token
+TRIMMED_SOURCE_CHARS = 800
+
+
+@cache
+def _bedrock_client(region_name: str):
+    """Return the process-wide bedrock-runtime client for a region.
+
+    boto3 clients are thread-safe, so one pooled keep-alive client serves
+    every agent instance and every concurrently running graph node.
+    """
+    boto_config = Config(
+        read_timeout=6000,
+        retries={"max_attempts": 3, "mode": "adaptive"},
+        max_pool_connections=BEDROCK_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+    )
+    return boto3.client("bedrock-runtime", region_name=region_name, config=boto_config)
+
+
+def _cached_text(text: str) -> dict:
+    """Build an Anthropic text block marked as a prompt-cache breakpoint."""
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
+
+@cache
+def _encoding() -> tiktoken.Encoding | None:
+    """Return the tokenizer used to approximate Claude prompt sizes, or None when it cannot be loaded.
+
+    tiktoken downloads its BPE file on first use, which fails without access to its blob host.
+    """
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        print("⚠ トークナイザーを読み込めないため、バイト数からトークン数を概算します")
+        return None
+
+
+def _count_tokens(text: str) -> int:
+    """Approximate the number of prompt tokens in ``text``."""
+    encoding = _encoding()
+    if encoding is None:
+        return len(text.encode("utf-8")) // FALLBACK_BYTES_PER_TOKEN + 1
+    return len(encoding.encode(text))
 
 
 class DeepResearchAgent:
@@ -20,21 +85,32 @@ class DeepResearchAgent:
     def __init__(self, settings: Settings) -> None:
         """Initialize agent."""
         self.settings = settings
-        boto_config = Config(read_timeout=6000, retries={"max_attempts": 3})
-        bedrock_client = boto3.client(
-            "bedrock-runtime",
-            region_name=settings.aws_region,
-            config=boto_config,
-        )
-        self.llm = ChatBedrock(
-            model_id=settings.model_id,
-            client=bedrock_client,
-            model_kwargs={"temperature": settings.temperature, "max_tokens": settings.max_tokens},
-        )
+        llm_cache = build_llm_cache(settings)
+        self.llm = self._chat_model(settings.model_id, llm_cache)
+        # Classification/rewriting nodes (query retry, coverage, paper selection) use the smaller model.
+        self.llm_fast = self._chat_model(settings.fast_model_id, llm_cache)
         self.search_tools = SearchTools()
+        self.searchers = {
+            "arxiv": partial(self.search_tools.search_arxiv_async, max_results=3),
+            "web": partial(self.search_tools.search_web_async, max_results=3),
+            "kaggle-competition": self.search_tools.search_kaggle_competitions_async,
+            "kaggle-dataset": self.search_tools.search_kaggle_datasets_async,
+        }
+        self.source_digests: dict[tuple[str, str, str], str] = {}
+        self.explored_urls: set[str] = set()
+        self.search_memo: dict[tuple[str, str], asyncio.Task[list[SearchResult]]] = {}
         self.graph = self._build_graph()
 
-    def _generate_subqueries(self, state: ResearchState) -> ResearchState:
+    def _chat_model(self, model_id: str, llm_cache: BaseCache | None) -> ChatBedrock:
+        """Build a Bedrock chat model sharing the pooled client and LLM cache."""
+        return ChatBedrock(
+            model_id=model_id,
+            client=_bedrock_client(self.settings.aws_region),
+            model_kwargs={"temperature": self.settings.temperature, "max_tokens": self.settings.max_tokens},
+            cache=llm_cache,
+        )
+
+    async def _generate_subqueries(self, state: ResearchState) -> ResearchState:
         """Generate subqueries from main query or gaps."""
         iteration = state.get("iteration", 0)
         
@@ -43,247 +119,322 @@ class DeepResearchAgent:
             target = state["query"]
         else:
             print(f"\n🔄 反復 {iteration + 1}: 不足情報を補完するクエリを生成中...")
-            target = "不足している観点:\n" + "\n".join(state.get("gaps", []))
-
-        prompt = f"""Research Query: "{state['query']}"
-
-{target}
+            target = prompts.GAPS_TARGET_TMPL.format(gaps="\n".join(state.get("gaps", [])))
 
-この質問に包括的に答えるための、3-5個の具体的なSub Queryを生成してください。
-Sub Queryのみを1行ずつ返してください。"""
+        prompt = prompts.SUBQUERIES_TMPL.format(query=state["query"], target=target)
 
-        response = self.llm.invoke([SystemMessage(content="あなたはResearch Assistantです。"), HumanMessage(content=prompt)])
-        subqueries = [q.strip() for q in response.content.split("\n") if q.strip() and not q.startswith("#")]
+        response = await self.llm.with_structured_output(Subqueries).ainvoke(
+            [SystemMessage(content=prompts.ASSISTANT_SYSTEM), HumanMessage(content=prompt)]
+        )
+        subqueries = [q.strip() for q in response.queries if q.strip()]
         print(f"✓ {len(subqueries)}個のサブクエリを生成しました")
         
         existing = state.get("subqueries", [])
         return {"subqueries": existing + subqueries, "iteration": iteration + 1}
 
-    def _search_sources(self, state: ResearchState) -> ResearchState:
+    def _search(self, source: str, query: str) -> asyncio.Task[list[SearchResult]]:
+        """Search one source, sharing in-flight and finished calls for the same normalized query within a run."""
+        key = (source, normalize_query(query))
+        if key not in self.search_memo:
+            self.search_memo[key] = asyncio.ensure_future(self.searchers[source](query))
+        return self.search_memo[key]
+
+    async def _search_many(self, queries: list[str], sources: tuple[str, ...]) -> dict[str, list[SearchResult]]:
+        """Search every (query, source) pair concurrently and group results by query."""
+        queries = list(dict.fromkeys(queries))
+        semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
+
+        async def search(query: str, source: str) -> list[SearchResult]:
+            async with semaphore:
+                return await self._search(source, query)
+
+        pairs = [(query, source) for query in queries for source in sources]
+        outcomes = await asyncio.gather(*(search(q, s) for q, s in pairs), return_exceptions=True)
+
+        grouped: dict[str, list[SearchResult]] = {query: [] for query in queries}
+        for (query, _), outcome in zip(pairs, outcomes):
+            if isinstance(outcome, BaseException):
+                continue
+            grouped[query].extend(outcome)
+        return grouped
+
+    async def _search_sources(self, state: ResearchState) -> ResearchState:
         """Search multiple sources for information."""
         iteration = state.get("iteration", 1)
         print(f"\n🔍 検索中 (反復 {iteration}/{MAX_ITERATIONS})...")
 
-        results = list(state.get("search_results", []))
+        store = state["search_results"]
         new_queries = state["subqueries"][-5:]
-        low_result_queries = []
-
         for i, subquery in enumerate(new_queries, 1):
             print(f"  [{i}/{len(new_queries)}] {subquery}")
-            arxiv_results = self.search_tools.search_arxiv(subquery, max_results=3)
-            web_results = self.search_tools.search_web(subquery, max_results=3)
-            kaggle_comps = self.search_tools.search_kaggle_competitions(subquery)
-            kaggle_datasets = self.search_tools.search_kaggle_datasets(subquery)
 
-            query_results = []
-            query_results.extend([{"query": subquery, "source": "arxiv", **r} for r in arxiv_results])
-            query_results.extend([{"query": subquery, "source": "web", **r} for r in web_results])
-            query_results.extend([{"query": subquery, "source": "kaggle-competition", **r} for r in kaggle_comps])
-            query_results.extend([{"query": subquery, "source": "kaggle-dataset", **r} for r in kaggle_datasets])
-
-            if len(query_results) < 2:
-                low_result_queries.append(subquery)
-            results.extend(query_results)
+        grouped = await self._search_many(new_queries, PRIMARY_SOURCES)
+        low_result_queries = [subquery for subquery, query_results in grouped.items() if len(query_results) < 2]
+        for subquery, query_results in grouped.items():
+            store.extend(subquery, query_results)
 
         # 結果が少ないクエリを改善して再検索
         if low_result_queries:
             print(f"\n🔧 {len(low_result_queries)}個のクエリを改善中...")
-            improved = self._improve_queries(low_result_queries, state["query"])
+            improved = await self._improve_queries(low_result_queries, state["query"])
             for subquery in improved:
                 print(f"  → {subquery}")
-                arxiv_results = self.search_tools.search_arxiv(subquery, max_results=3)
-                web_results = self.search_tools.search_web(subquery, max_results=3)
-                results.extend([{"query": subquery, "source": "arxiv", **r} for r in arxiv_results])
-                results.extend([{"query": subquery, "source": "web", **r} for r in web_results])
+            for subquery, query_results in (await self._search_many(improved, RETRY_SOURCES)).items():
+                store.extend(subquery, query_results)
 
-        print(f"✓ 合計 {len(results)}個のソースを収集")
-        return {"search_results": results}
+        print(f"✓ 合計 {len(store)}個のソースを収集")
+        query_sources = {subquery: [r.source for r in query_results] for subquery, query_results in grouped.items()}
+        return {"search_results": store, "query_sources": query_sources}
 
-    def _improve_queries(self, queries: list[str], original_query: str) -> list[str]:
+    async def _improve_queries(self, queries: list[str], original_query: str) -> list[str]:
         """Improve queries that returned few results."""
-        prompt = f"""元のクエリ: "{original_query}"
-
-以下の検索クエリは結果が少なかったです:
-{chr(10).join(f'- {q}' for q in queries)}
+        prompt = prompts.IMPROVE_QUERIES_TMPL.format(query=original_query, queries="\n".join(f"- {q}" for q in queries))
 
-各クエリを言い換えて、より検索結果が得られやすい形に改善してください。
-- 専門用語を一般的な言葉に
-- 英語のキーワードを追加
-- より広い概念に変更
-
-改善したクエリのみを1行ずつ出力してください。"""
-
-        response = self.llm.invoke([
-            SystemMessage(content="あなたは検索クエリ最適化の専門家です。"),
+        response = await self.llm_fast.with_structured_output(ImprovedQueries).ainvoke([
+            SystemMessage(content=prompts.QUERY_OPTIMIZER_SYSTEM),
             HumanMessage(content=prompt)
         ])
-        return [q.strip().lstrip("-•").strip() for q in response.content.split("\n") if q.strip()][:len(queries)]
+        return [q.strip() for q in response.queries if q.strip()][:len(queries)]
 
-    def _evaluate_coverage(self, state: ResearchState) -> ResearchState:
+    async def _evaluate_coverage(self, state: ResearchState) -> ResearchState:
         """Evaluate if collected information is sufficient."""
         print("\n📊 情報の網羅性を評価中...")
-        
-        results_summary = "\n".join([f"- [{r['source']}] {r['title']}" for r in state["search_results"][:30]])
-        
-        prompt = f"""クエリ: "{state['query']}"
 
-収集した情報源:
-{results_summary}
+        # 追加検索できない場合は評価しても結果が変わらない
+        if state.get("iteration", 0) >= MAX_ITERATIONS:
+            print("✓ 反復上限に達したため評価をスキップします")
+            return {"needs_more_search": False, "gaps": []}
 
-この情報で元のクエリに十分答えられますか？
-- 十分な場合: 「SUFFICIENT」とだけ回答
-- 不足がある場合: 不足している観点を箇条書きで列挙（最大3つ）"""
+        if self._has_obvious_coverage(state["query_sources"]):
+            print("✓ 情報は十分です（全サブクエリで十分な件数と多様なソースを確認）")
+            return {"needs_more_search": False, "gaps": []}
 
-        response = self.llm.invoke([SystemMessage(content="あなたはResearch評価者です。"), HumanMessage(content=prompt)])
-        
-        if "SUFFICIENT" in response.content:
+        store = state["search_results"]
+        results_summary = "\n".join(f"- [{source}] {title}" for source, title in zip(store.sources[:30], store.titles[:30]))
+
+        prompt = prompts.COVERAGE_TMPL.format(sources=results_summary, query=state["query"])
+
+        response = await self.llm_fast.with_structured_output(Coverage).ainvoke(
+            [SystemMessage(content=prompts.EVALUATOR_SYSTEM), HumanMessage(content=prompt)]
+        )
+        gaps = [g.strip() for g in response.gaps if g.strip()][:3]
+
+        if response.sufficient or not gaps:
             print("✓ 情報は十分です")
             return {"needs_more_search": False, "gaps": []}
-        
-        gaps = [line.strip().lstrip("-•").strip() for line in response.content.split("\n") if line.strip() and not line.startswith("不足")]
-        gaps = [g for g in gaps if g][:3]
+
         print(f"⚠ 不足している観点: {len(gaps)}個")
         for gap in gaps:
             print(f"  - {gap}")
         return {"needs_more_search": True, "gaps": gaps}
 
-    def _should_continue_search(self, state: ResearchState) -> str:
-        """Decide whether to continue searching or proceed to deep dive."""
+    def _has_obvious_coverage(self, query_sources: dict[str, list[str]]) -> bool:
+        """Check whether every subquery of the latest round got enough results from enough distinct sources.
+
+        Counts come from the raw search hits rather than the store, so a subquery whose hits
+        were already stored (a near-duplicate or a later-iteration query) still counts them.
+        """
+        return bool(query_sources) and all(
+            len(sources) >= COVERAGE_MIN_RESULTS and len(set(sources)) >= COVERAGE_MIN_SOURCES
+            for sources in query_sources.values()
+        )
+
+    def _should_continue_search(self, state: ResearchState) -> str | list[str]:
+        """Decide whether to continue searching or fan out to deep dive and verification."""
         if state.get("needs_more_search") and state.get("iteration", 0) < MAX_ITERATIONS:
             return "generate_subqueries"
-        return "deep_dive"
+        return ["deep_dive", "verify_information"]
 
-    def _deep_dive(self, state: ResearchState) -> ResearchState:
-        """Extract key references from results and explore them deeper."""
+    async def _deep_dive(self, state: ResearchState) -> ResearchState:
+        """Explore references of key papers recursively up to MAX_DEPTH."""
+        store = state["search_results"]
         depth = state.get("depth", 0)
-        if depth >= MAX_DEPTH:
-            return {}
 
-        print(f"\n🔬 深掘り調査中 (深度 {depth + 1}/{MAX_DEPTH})...")
+        while depth < MAX_DEPTH:
+            print(f"\n🔬 深掘り調査中 (深度 {depth + 1}/{MAX_DEPTH})...")
+            depth += 1
+            if not await self._explore_references(state["query"], store):
+                break
+
+        return {"search_results": store, "depth": depth}
 
-        explored = state.get("explored_urls") or set()
-        arxiv_results = [r for r in state["search_results"] if r["source"] == "arxiv" and r["url"] not in explored]
+    async def _explore_references(self, query: str, store: ResultStore) -> int:
+        """Add related work of key papers to the store and return how many results were added."""
+        explored = self.explored_urls
+        candidates = [i for i, source in enumerate(store.sources) if source == "arxiv" and store.urls[i] not in explored]
 
-        if not arxiv_results:
+        if not candidates:
             print("  深掘り対象なし")
-            return {"depth": depth + 1}
+            return 0
 
         # 重要な論文を特定
-        prompt = f"""以下の論文から、元のクエリ「{state['query']}」を深く理解するために
-さらに調査すべき最も重要な論文を最大2つ選んでください。
-
-論文リスト:
-{chr(10).join(f"- {r['title']}" for r in arxiv_results[:10])}
-
-選んだ論文のタイトルのみを1行ずつ出力してください。"""
+        prompt = prompts.PAPER_SELECTION_TMPL.format(
+            papers="\n".join(f"- {store.titles[i]}" for i in candidates[:10]), query=query
+        )
 
-        response = self.llm.invoke([
-            SystemMessage(content="あなたはResearch Assistantです。"),
+        response = await self.llm_fast.with_structured_output(PaperSelection).ainvoke([
+            SystemMessage(content=prompts.ASSISTANT_SYSTEM),
             HumanMessage(content=prompt)
         ])
 
-        selected_titles = [t.strip().lstrip("-•").strip() for t in response.content.split("\n") if t.strip()]
-        selected = [r for r in arxiv_results if any(t in r["title"] for t in selected_titles)][:2]
+        selected_titles = [t.strip() for t in response.titles if t.strip()]
+        selected = [i for i in candidates if any(t in store.titles[i] for t in selected_titles)][:2]
 
         if not selected:
-            return {"depth": depth + 1}
+            return 0
 
-        # 選んだ論文の関連研究を検索
-        new_results = []
-        new_explored = set(explored)
-        for paper in selected:
-            print(f"  → {paper['title'][:50]}...")
-            new_explored.add(paper["url"])
+        # 選んだ論文の関連研究を並列に検索
+        for i in selected:
+            print(f"  → {store.titles[i][:50]}...")
+            explored.add(store.urls[i])
+        related_by_title = await self._search_many([store.titles[i] for i in selected], ("arxiv",))
 
-            # 論文タイトルで関連研究を検索
-            related = self.search_tools.search_arxiv(paper["title"], max_results=3)
+        added = 0
+        for title, related in related_by_title.items():
             for r in related:
-                if r["url"] not in new_explored:
-                    new_results.append({"query": f"related to: {paper['title']}", "source": "arxiv-deep", **r})
-                    new_explored.add(r["url"])
-
-        print(f"  ✓ {len(new_results)}個の関連論文を発見")
-        return {
-            "search_results": state["search_results"] + new_results,
-            "depth": depth + 1,
-            "explored_urls": new_explored,
-        }
+                if r.url not in explored:
+                    added += store.add(f"related to: {title}", replace(r, source="arxiv-deep"))
+                    explored.add(r.url)
 
-    def _should_continue_deep_dive(self, state: ResearchState) -> str:
-        """Decide whether to continue deep diving."""
-        if state.get("depth", 0) < MAX_DEPTH:
-            new_deep_results = [r for r in state["search_results"] if r["source"] == "arxiv-deep"]
-            if new_deep_results:
-                return "deep_dive"
-        return "verify_information"
+        print(f"  ✓ {added}個の関連論文を発見")
+        return added
 
-    def _verify_information(self, state: ResearchState) -> ResearchState:
+    async def _verify_information(self, state: ResearchState) -> ResearchState:
         """Verify information across sources and detect contradictions."""
         print("\n🔍 情報の検証・クロスチェック中...")
 
+        store = state["search_results"]
         results_text = "\n\n".join(
-            [f"[{i+1}] [{r['source']}] {r['title']}\n{r.get('summary', r.get('content', ''))[:300]}"
-             for i, r in enumerate(state["search_results"][:20])]
+            f"[{i+1}] [{source}] {title}\n{body[:300]}"
+            for i, (source, title, body) in enumerate(zip(store.sources[:20], store.titles[:20], store.bodies[:20]))
         )
 
-        prompt = f"""クエリ: "{state['query']}"
-
-収集した情報:
-{results_text}
-
-以下の観点で情報を検証してください:
-1. 矛盾する主張: 異なるソース間で矛盾する情報があれば指摘
-2. 信頼性評価: 学術論文(arxiv)は高信頼、一般Web記事は要注意
-3. 情報の鮮度: 古い情報と新しい情報の違いがあれば指摘
-
-検証レポートを簡潔に日本語で出力してください。矛盾がなければ「主要な矛盾は検出されませんでした」と記載。"""
+        prompt = prompts.VERIFY_TMPL.format(sources=results_text, query=state["query"])
 
-        response = self.llm.invoke([
-            SystemMessage(content="あなたは情報検証の専門家です。"),
+        response = await self.llm.ainvoke([
+            SystemMessage(content=prompts.VERIFIER_SYSTEM),
             HumanMessage(content=prompt)
         ])
 
         print("✓ 検証完了")
         return {"verification_report": response.content}
 
-    def _generate_outline(self, state: ResearchState) -> ResearchState:
+    async def _batch_llm(
+        self, prompt_texts: list[str], system: str, model: Runnable | None = None, return_exceptions: bool = True
+    ) -> list[Any]:
+        """Run independent prompts concurrently against ``model`` (the fast model by default).
+
+        A failed call yields its exception in place of a response so the other calls
+        still complete; pass ``return_exceptions=False`` for all-or-nothing behaviour.
+        """
+        model = model or self.llm_fast
+        return await asyncio.gather(
+            *(model.ainvoke([SystemMessage(content=system), HumanMessage(content=text)]) for text in prompt_texts),
+            return_exceptions=return_exceptions,
+        )
+
+    def _digest_prompt(self, query: str, store: ResultStore, batch: list[int]) -> str:
+        """Build the fact-extraction prompt for a batch of sources."""
+        sources_text = "\n\n".join(
+            f"[{n}] [{store.sources[i]}] {store.titles[i]}\n{store.bodies[i]}" for n, i in enumerate(batch, 1)
+        )
+        return prompts.DIGEST_TMPL.format(sources=sources_text, query=query)
+
+    async def _summarize_sources(self, state: ResearchState) -> ResearchState:
+        """Condense sources into key facts in parallel batches and assemble the evidence block."""
+        print("\n🗜 情報源を要約中...")
+        query = state["query"]
+        store = state["search_results"]
+
+        # map: 未要約の情報源をバッチごとに並列で要約
+        pending = [i for i, key in enumerate(zip(store.urls, store.titles)) if (query, *key) not in self.source_digests]
+        batches = [pending[i:i + SUMMARY_BATCH_SIZE] for i in range(0, len(pending), SUMMARY_BATCH_SIZE)]
+        digests = await self._batch_llm(
+            [self._digest_prompt(query, store, batch) for batch in batches],
+            prompts.ASSISTANT_SYSTEM,
+            self.llm_fast.with_structured_output(SourceDigest),
+        )
+        fallbacks: dict[int, str] = {}
+        for batch, digest in zip(batches, digests):
+            if isinstance(digest, BaseException) or digest is None:
+                # 失敗したバッチは本文冒頭で代替し、次回の実行で再要約できるようキャッシュしない
+                fallbacks.update((i, store.bodies[i][:300]) for i in batch)
+                continue
+            facts = {item.index: item.facts for item in digest.sources}
+            for n, i in enumerate(batch, 1):
+                lines = [f"- {fact}" for fact in facts.get(n, [])[:2]]
+                self.source_digests[(query, store.urls[i], store.titles[i])] = "\n".join(lines) or store.bodies[i][:300]
+        if fallbacks:
+            print(f"⚠ {len(fallbacks)}個の情報源の要約に失敗したため本文冒頭で代替しました")
+
+        # reduce: 要約済みの事実と引用URLをトークン予算内でまとめる
+        digests = [
+            fallbacks[i] if i in fallbacks else self.source_digests[(query, url, title)]
+            for i, (url, title) in enumerate(zip(store.urls, store.titles))
+        ]
+        blocks = self._pack_evidence(store, digests, state.get("verification_report", ""))
+        if len(blocks) < len(store):
+            print(f"⚠ トークン予算超過のため{len(store) - len(blocks)}個の情報源を除外しました")
+        print(f"✓ {len(store)}個の情報源を要約しました")
+        return {"evidence": "\n\n".join(blocks)}
+
+    def _pack_evidence(self, store: ResultStore, digests: list[str], verification: str = "") -> list[str]:
+        """Greedily pack source blocks, most trusted and densest first, into the prompt token budget.
+
+        The budget leaves room for the outline and the verification report (both
+        embedded in the article prompt), the article itself and the fixed instructions.
+        """
+        remaining = (
+            self.settings.context_window
+            - 2 * self.settings.max_tokens
+            - _count_tokens(verification)
+            - PROMPT_OVERHEAD_TOKENS
+        )
+        order = sorted(range(len(store)), key=lambda i: (SOURCE_RANK.get(store.sources[i], len(SOURCE_RANK)), -len(digests[i])))
+
+        blocks = []
+        for i in order:
+            header, footer = f"[{store.sources[i]}] {store.titles[i]}\n", f"\nURL: {store.urls[i]}"
+            block = header + digests[i] + footer
+            tokens = _count_tokens(block)
+            if tokens > remaining:
+                block = header + digests[i][:TRIMMED_SOURCE_CHARS] + footer
+                tokens = _count_tokens(block)
+                if tokens > remaining:
+                    continue
+            blocks.append(block)
+            remaining -= tokens
+        return blocks
+
+    def _sources_block(self, state: ResearchState) -> dict:
+        """Build the cached evidence block shared by the outline and article prompts."""
+        return _cached_text(prompts.SOURCES_BLOCK_TMPL.format(evidence=state["evidence"]))
+
+    async def _generate_outline(self, state: ResearchState) -> ResearchState:
         """Generate article outline from search results."""
         print("\n📋 記事のアウトラインを生成中...")
-        results_text = "\n\n".join([f"- {r['title']}: {r.get('summary', r.get('content', ''))[:200]}" for r in state["search_results"]])
-        prompt = f"""クエリ: "{state['query']}"
-
-検索結果:
-{results_text}
-
-これらの情報に基づいて、詳細な記事のアウトラインをセクションとサブセクションで作成してください。
-日本語で出力してください。"""
+        prompt = prompts.OUTLINE_TMPL.format(query=state["query"])
 
-        response = self.llm.invoke([SystemMessage(content="あなたはResearch Writerです。"), HumanMessage(content=prompt)])
+        response = await self.llm.ainvoke([
+            SystemMessage(content=prompts.WRITER_SYSTEM),
+            HumanMessage(content=[self._sources_block(state), {"type": "text", "text": prompt}]),
+        ])
         print("✓ アウトラインを生成しました")
         return {"outline": response.content}
 
-    def _generate_article(self, state: ResearchState) -> ResearchState:
+    async def _generate_article(self, state: ResearchState) -> ResearchState:
         """Generate final article."""
         print("\n📝 最終記事を生成中...")
-        results_text = "\n\n".join([f"[{r['source']}] {r['title']}\n{r.get('summary', r.get('content', ''))}\nURL: {r['url']}" for r in state["search_results"]])
-        
         verification = state.get("verification_report", "")
-        verification_note = f"\n\n検証結果を考慮してください:\n{verification}" if verification else ""
-        
-        prompt = f"""以下のアウトラインに従って、包括的なリサーチ記事を日本語で執筆してください:
-
-{state['outline']}
+        verification_note = prompts.VERIFICATION_NOTE_TMPL.format(verification=verification) if verification else ""
 
-以下の情報源を使用してください:
-{results_text}
-{verification_note}
+        prompt = prompts.ARTICLE_TMPL.format(outline=state["outline"], verification_note=verification_note)
 
-各主張の後に引用URL [source] を含めてください。
-矛盾する情報がある場合は両論併記してください。
-全て日本語で出力してください。"""
-
-        response = self.llm.invoke([SystemMessage(content="あなたはResearch Writerです。"), HumanMessage(content=prompt)])
-        print("✓ 記事を生成しました")
+        response = await self.llm.ainvoke([
+            SystemMessage(content=prompts.WRITER_SYSTEM),
+            HumanMessage(content=[self._sources_block(state), {"type": "text", "text": prompt}]),
+        ])
+        print("\n✓ 記事を生成しました")  # ends the line of streamed article tokens
         return {"article": response.content}
 
     def _build_graph(self) -> StateGraph:
@@ -294,6 +445,7 @@ Sub Queryのみを1行ずつ返してください。"""
         workflow.add_node("evaluate_coverage", self._evaluate_coverage)
         workflow.add_node("deep_dive", self._deep_dive)
         workflow.add_node("verify_information", self._verify_information)
+        workflow.add_node("summarize_sources", self._summarize_sources)
         workflow.add_node("generate_outline", self._generate_outline)
         workflow.add_node("generate_article", self._generate_article)
 
@@ -301,28 +453,43 @@ Sub Queryのみを1行ずつ返してください。"""
         workflow.add_edge("generate_subqueries", "search_sources")
         workflow.add_edge("search_sources", "evaluate_coverage")
         workflow.add_conditional_edges("evaluate_coverage", self._should_continue_search)
-        workflow.add_conditional_edges("deep_dive", self._should_continue_deep_dive)
-        workflow.add_edge("verify_information", "generate_outline")
+        workflow.add_edge(["deep_dive", "verify_information"], "summarize_sources")
+        workflow.add_edge("summarize_sources", "generate_outline")
         workflow.add_edge("generate_outline", "generate_article")
         workflow.add_edge("generate_article", END)
 
         return workflow.compile()
 
-    def research(self, query: str) -> dict:
-        """Run research workflow."""
-        initial_state: ResearchState = {
+    def _initial_state(self, query: str) -> ResearchState:
+        """Reset per-run bookkeeping and build the initial workflow state for a query."""
+        self.explored_urls.clear()
+        self.search_memo.clear()
+        return {
             "query": query,
             "subqueries": [],
             "outline": "",
-            "search_results": [],
+            "search_results": ResultStore(),
             "article": "",
             "messages": [],
             "iteration": 0,
             "needs_more_search": False,
             "gaps": [],
+            "query_sources": {},
             "verification_report": "",
+            "evidence": "",
             "depth": 0,
-            "explored_urls": set(),
         }
-        result = self.graph.invoke(initial_state)
-        return result
+
+    def research(self, query: str) -> dict:
+        """Run research workflow."""
+        return asyncio.run(self.graph.ainvoke(self._initial_state(query)))
+
+    async def astream(self, query: str) -> AsyncIterator[tuple[str, Any]]:
+        """Run research workflow, streaming state snapshots and LLM tokens.
+
+        Yields ("values", state) after every step and ("messages", (chunk, metadata))
+        for every LLM token as it is generated; metadata["langgraph_node"] names
+        the node that issued the call.
+        """
+        async for event in self.graph.astream(self._initial_state(query), stream_mode=["values", "messages"]):
+            yield event
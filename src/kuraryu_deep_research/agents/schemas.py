@@ -0,0 +1,41 @@
+"""Structured output schemas for Deep Research Agent."""
+
+from pydantic import BaseModel, Field
+
+
+class Subqueries(BaseModel):
+    """Sub queries that together answer the research query."""
+
+    queries: list[str] = Field(description="3-5 specific sub queries")
+
+
+class ImprovedQueries(BaseModel):
+    """Rewritten search queries, one per original query, in the same order."""
+
+    queries: list[str] = Field(description="Improved search queries")
+
+
+class Coverage(BaseModel):
+    """Assessment of whether the collected sources answer the query."""
+
+    sufficient: bool = Field(description="True if the sources are sufficient to answer the query")
+    gaps: list[str] = Field(default_factory=list, description="Missing perspectives (at most 3) when not sufficient")
+
+
+class PaperSelection(BaseModel):
+    """Papers selected for deeper investigation."""
+
+    titles: list[str] = Field(description="Titles of the selected papers, copied verbatim from the list")
+
+
+class SourceFacts(BaseModel):
+    """Key facts extracted from one numbered source."""
+
+    index: int = Field(description="Number of the source in the list")
+    facts: list[str] = Field(description="Up to 2 key facts relevant to the query")
+
+
+class SourceDigest(BaseModel):
+    """Key facts extracted from each numbered source."""
+
+    sources: list[SourceFacts]
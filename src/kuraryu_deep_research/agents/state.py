@@ -1,9 +1,71 @@
 """State definitions for Deep Research Agent."""
 
-from typing import Annotated, TypedDict
+from dataclasses import dataclass, field
+from typing import Annotated, Any, Iterable, TypedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit
 
 from langgraph.graph import add_messages
 
+from ..tools import SearchResult
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL for duplicate detection (scheme, case, tracking params, trailing slash)."""
+    parts = urlsplit(url.strip())
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not k.lower().startswith("utm_")])
+    return f"{parts.netloc.lower()}{parts.path.rstrip('/')}" + (f"?{query}" if query else "")
+
+
+@dataclass
+class ResultStore:
+    """Search results stored column-wise, deduplicated by canonical URL.
+
+    Row ``i`` is spread across ``queries[i]``, ``sources[i]``, ``titles[i]``,
+    ``urls[i]``, ``bodies[i]`` (arXiv summary or web/Kaggle content) and
+    ``details[i]`` (the result's ``extra`` fields such as authors or published date).
+    """
+
+    queries: list[str] = field(default_factory=list)
+    sources: list[str] = field(default_factory=list)
+    titles: list[str] = field(default_factory=list)
+    urls: list[str] = field(default_factory=list)
+    bodies: list[str] = field(default_factory=list)
+    details: list[dict[str, Any]] = field(default_factory=list)
+    url_to_idx: dict[str, int] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def __contains__(self, url: str) -> bool:
+        return canonical_url(url) in self.url_to_idx
+
+    def add(self, query: str, result: SearchResult) -> bool:
+        """Append a result found by ``query`` unless its URL is already stored; results without a URL are always kept."""
+        if result.url:
+            key = canonical_url(result.url)
+            if key in self.url_to_idx:
+                return False
+            self.url_to_idx[key] = len(self.urls)
+
+        self.queries.append(query)
+        self.sources.append(result.source)
+        self.titles.append(result.title)
+        self.urls.append(result.url)
+        self.bodies.append(result.content)
+        self.details.append(result.extra or {})
+        return True
+
+    def extend(self, query: str, results: Iterable[SearchResult]) -> int:
+        """Append results found by ``query``, skipping duplicate URLs, and return how many were added."""
+        return sum(self.add(query, r) for r in results)
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        """Materialize rows as dicts for report I/O."""
+        return [
+            {"query": q, "source": s, "title": t, "url": u, "content": b, **d}
+            for q, s, t, u, b, d in zip(self.queries, self.sources, self.titles, self.urls, self.bodies, self.details)
+        ]
+
 
 class ResearchState(TypedDict):
     """State for research workflow."""
@@ -11,12 +73,13 @@ class ResearchState(TypedDict):
     query: str
     subqueries: list[str]
     outline: str
-    search_results: list[dict]
+    search_results: ResultStore
     article: str
     messages: Annotated[list, add_messages]
     iteration: int
     needs_more_search: bool
     gaps: list[str]
+    query_sources: dict[str, list[str]]  # source label of every hit per subquery in the latest search round
     verification_report: str
+    evidence: str
     depth: int
-    explored_urls: set[str]
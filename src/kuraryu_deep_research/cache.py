@@ -0,0 +1,26 @@
+"""LLM response cache for Deep Research Agent."""
+
+from pathlib import Path
+
+from langchain_core.caches import BaseCache, InMemoryCache
+
+from .config import Settings
+
+
+def build_llm_cache(settings: Settings) -> BaseCache | None:
+    """Build the LLM response cache selected by settings.
+
+    Responses are only cached when sampling is deterministic (temperature=0),
+    keyed on the model parameters and the full message list.
+    """
+    if settings.temperature != 0 or settings.llm_cache == "none":
+        return None
+    if settings.llm_cache == "memory":
+        return InMemoryCache(maxsize=settings.llm_cache_size)
+    if settings.llm_cache == "sqlite":
+        from langchain_community.cache import SQLiteCache
+
+        path = Path(settings.llm_cache_path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return SQLiteCache(database_path=str(path))
+    raise ValueError(f"Unknown llm_cache backend: {settings.llm_cache}")
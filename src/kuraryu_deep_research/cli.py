@@ -1,31 +1,19 @@
 """CLI interface for Deep Research Agent."""
 
+import asyncio
 import sys
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
+from typing import BinaryIO
 
-from kuraryu_deep_research import DeepResearchAgent, Settings
+import orjson
 
+from kuraryu_deep_research import DeepResearchAgent, get_settings
 
-def main() -> None:
-    """Run Deep Research Agent CLI."""
-    if len(sys.argv) < 2:
-        print("Usage: deep-research <query>")
-        sys.exit(1)
-
-    query = " ".join(sys.argv[1:])
-    settings = Settings()
-    agent = DeepResearchAgent(settings)
-
-    print("\n" + "=" * 80)
-    print(f"🔍 Deep Research Agent")
-    print("=" * 80)
-    print(f"\n📌 クエリ: {query}")
-    print(f"⏰ 開始時刻: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("\n" + "=" * 80)
-
-    result = agent.research(query)
 
+def _print_summary(result: dict, source_counts: Counter[str]) -> None:
+    """Print subqueries, source statistics and the outline."""
     print("\n" + "=" * 80)
     print("📊 リサーチ結果")
     print("=" * 80)
@@ -37,45 +25,108 @@ def main() -> None:
     print(f"\n🔄 検索反復回数: {result.get('iteration', 1)}回")
 
     print(f"\n📚 収集したソース: {len(result['search_results'])}個")
-    source_counts = {}
-    for r in result["search_results"]:
-        source = r["source"]
-        source_counts[source] = source_counts.get(source, 0) + 1
-    for source, count in source_counts.items():
+    for source, count in source_counts.most_common():
         print(f"  - {source}: {count}個")
 
     print("\n📋 記事アウトライン:")
     print("-" * 80)
     print(result["outline"])
 
-    print("\n📄 最終記事:")
-    print("=" * 80)
-    print(result["article"])
+
+def _report_header(query: str, result: dict, source_counts: Counter[str]) -> list[bytes]:
+    """Build everything in the report that precedes the article body."""
+    parts = [
+        f"# Research Report: {query}\n\n",
+        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+        "## Subqueries\n\n",
+        *(f"{i}. {sq}\n" for i, sq in enumerate(result["subqueries"], 1)),
+        "\n## Sources\n\n",
+        f"Total: {len(result['search_results'])} sources\n\n",
+        *(f"- {source}: {count}\n" for source, count in source_counts.most_common()),
+        "\n## Outline\n\n",
+        result["outline"],
+        "\n\n## Article\n\n",
+    ]
+    return [part.encode("utf-8") for part in parts]
+
+
+def _write_json_report(path: Path, query: str, result: dict) -> None:
+    """Write a machine-readable copy of the research result."""
+    payload = {
+        "query": query,
+        "subqueries": result.get("subqueries", []),
+        "iteration": result.get("iteration", 0),
+        "search_results": result["search_results"].to_dicts(),
+        "verification_report": result.get("verification_report", ""),
+        "outline": result.get("outline", ""),
+        "article": result.get("article", ""),
+    }
+    path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+
+
+async def _run(agent: DeepResearchAgent, query: str, output_path: Path) -> dict:
+    """Run research, streaming the article to stdout and the report file as it is generated."""
+    result: dict = {}
+    report: BinaryIO | None = None
+    streaming = False
+    try:
+        async for mode, payload in agent.astream(query):
+            if mode == "values":
+                result = payload
+                if report is None and result.get("outline"):
+                    source_counts = Counter(result["search_results"].sources)
+                    _print_summary(result, source_counts)
+                    report = output_path.open("wb")
+                    report.writelines(_report_header(query, result, source_counts))
+                continue
+
+            chunk, metadata = payload
+            if report is not None and metadata.get("langgraph_node") == "generate_article":
+                if not streaming:
+                    # generate_articleの開始メッセージの後に見出しを出す
+                    print("\n📄 最終記事:")
+                    print("=" * 80)
+                    streaming = True
+                sys.stdout.write(chunk.text)
+                sys.stdout.flush()
+                report.write(chunk.text.encode("utf-8"))
+    finally:
+        if report is not None:
+            report.close()
+    return result
+
+
+def main() -> None:
+    """Run Deep Research Agent CLI."""
+    if len(sys.argv) < 2:
+        print("Usage: deep-research <query>")
+        sys.exit(1)
+
+    query = " ".join(sys.argv[1:])
+    settings = get_settings()
+    agent = DeepResearchAgent(settings)
+
+    print("\n" + "=" * 80)
+    print(f"🔍 Deep Research Agent")
     print("=" * 80)
+    print(f"\n📌 クエリ: {query}")
+    print(f"⏰ 開始時刻: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("\n" + "=" * 80)
 
-    # Save to file
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"research_report_{timestamp}.md"
     output_dir = Path(__file__).parent / "reports"
     output_dir.mkdir(exist_ok=True)
     output_path = output_dir / filename
 
-    with output_path.open("w", encoding="utf-8") as f:
-        f.write(f"# Research Report: {query}\n\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write("## Subqueries\n\n")
-        for i, sq in enumerate(result["subqueries"], 1):
-            f.write(f"{i}. {sq}\n")
-        f.write(f"\n## Sources\n\n")
-        f.write(f"Total: {len(result['search_results'])} sources\n\n")
-        for source, count in source_counts.items():
-            f.write(f"- {source}: {count}\n")
-        f.write("\n## Outline\n\n")
-        f.write(result["outline"])
-        f.write("\n\n## Article\n\n")
-        f.write(result["article"])
+    result = asyncio.run(_run(agent, query, output_path))
+    print("\n" + "=" * 80)
+
+    json_path = output_path.with_suffix(".json")
+    _write_json_report(json_path, query, result)
 
     print(f"\n💾 レポート保存先: {output_path.absolute()}")
+    print(f"💾 JSON保存先: {json_path.absolute()}")
     print(f"⏰ 完了時刻: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
 
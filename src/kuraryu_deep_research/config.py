@@ -1,20 +1,56 @@
 """Configuration for Deep Research Agent."""
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+import os
+from dataclasses import dataclass, field
+from functools import cache, lru_cache
+from pathlib import Path
+from typing import Callable, TypeVar
 
+T = TypeVar("T")
 
-class Settings(BaseSettings):
-    """Application settings."""
 
-    # load .env file's settings using pydantic_settings
-    # model_config = SettingsConfigDict(
-    #     env_file=".env",
-    #     env_file_encoding="utf-8",
-    # )
-    aws_region: str = "us-west-2"
-    model_id: str = "global.anthropic.claude-opus-4-5-20251101-v1:0"
-    temperature: float = 0.0
-    max_tokens: int = 8192*2 # max 200K tokens
+@cache
+def _dotenv(path: str = ".env") -> dict[str, str]:
+    """Parse ``KEY=VALUE`` lines of a .env file in the working directory, if there is one."""
+    env_file = Path(path)
+    if not env_file.is_file():
+        return {}
+    values = {}
+    for line in env_file.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, _, value = line.removeprefix("export ").partition("=")
+        values[key.strip().upper()] = value.strip().strip("'\"")
+    return values
 
-    class Config:
-        env_file = ".env"
+
+def _env(name: str, default: T, cast: Callable[[str], T] = str) -> Callable[[], T]:
+    """Default factory reading ``name`` from the environment, then .env, then ``default``."""
+
+    def factory() -> T:
+        value = os.environ.get(name, _dotenv().get(name))
+        return default if value is None else cast(value)
+
+    return factory
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Application settings; unset fields come from environment variables or .env."""
+
+    aws_region: str = field(default_factory=_env("AWS_REGION", "us-west-2"))
+    model_id: str = field(default_factory=_env("MODEL_ID", "global.anthropic.claude-opus-4-5-20251101-v1:0"))
+    fast_model_id: str = field(default_factory=_env("FAST_MODEL_ID", "global.anthropic.claude-haiku-4-5-20251001-v1:0"))
+    temperature: float = field(default_factory=_env("TEMPERATURE", 0.0, float))
+    max_tokens: int = field(default_factory=_env("MAX_TOKENS", 8192*2, int)) # max 200K tokens
+    context_window: int = field(default_factory=_env("CONTEXT_WINDOW", 200_000, int))
+    llm_cache: str = field(default_factory=_env("LLM_CACHE", "sqlite"))  # "sqlite" | "memory" | "none"
+    llm_cache_path: str = field(default_factory=_env("LLM_CACHE_PATH", "~/.cache/kuraryu_deep_research/llm_cache.db"))
+    llm_cache_size: int = field(default_factory=_env("LLM_CACHE_SIZE", 1024, int))
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, reading the environment once."""
+    return Settings()
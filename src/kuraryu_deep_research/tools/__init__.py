@@ -1,5 +1,7 @@
 """Search tools package."""
 
+from .cache import normalize_query
+from .result import SearchResult
 from .search import SearchTools
 
-__all__ = ["SearchTools"]
+__all__ = ["SearchResult", "SearchTools", "normalize_query"]
@@ -0,0 +1,54 @@
+"""In-process TTL cache for read-only search calls, holding JSON-serialized results."""
+
+import inspect
+import threading
+from functools import wraps
+from typing import Any, Callable
+
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL = 600  # seconds; listings and papers change far less often than this
+
+_search_cache: TTLCache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+_lock = threading.Lock()
+
+EMPTY_RESULTS = b"[]"
+
+SearchMethod = Callable[..., bytes]
+
+
+def normalize_query(query: str) -> str:
+    """Canonicalize a query for caching and deduplication (case and whitespace only)."""
+    return " ".join(query.lower().split())
+
+
+def ttl_cached(func: SearchMethod) -> SearchMethod:
+    """Cache a search method's serialized results keyed by method, normalized query and remaining arguments.
+
+    Empty results are not cached because the search methods return
+    ``EMPTY_RESULTS`` on errors, and a transient failure should not stick
+    for the whole TTL.
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> bytes:
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        _, query, *rest = bound.arguments.values()
+        key = hashkey(func.__qualname__, normalize_query(query), *rest)
+
+        with _lock:
+            results = _search_cache.get(key)
+        if results is not None:
+            return results
+
+        results = func(self, *args, **kwargs)
+        if results != EMPTY_RESULTS:
+            with _lock:
+                _search_cache[key] = results
+        return results
+
+    return wrapper
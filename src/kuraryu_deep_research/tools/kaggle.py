@@ -1,81 +1,251 @@
 """Kaggle MCP integration for Deep Research Agent."""
 
-from typing import Any
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
 
-from kaggle.api.kaggle_api_extended import KaggleApi
+import orjson
+
+from .cache import EMPTY_RESULTS, ttl_cached
+from .resilience import ddg_breaker, guarded, http_retries, kaggle_breaker
+from .result import SearchResult, load_results
+
+if TYPE_CHECKING:
+    from duckduckgo_search import DDGS
+    from kaggle.api.kaggle_api_extended import KaggleApi
+    from kagglesdk.kaggle_client import KaggleClient
+
+KAGGLE_WORKERS = 4
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+CREDENTIAL_FILES = ("kaggle.json", "access_token", "access_token.txt", "credentials.json")
+_DISCUSSION_TEMPLATE = "site:kaggle.com/discussions {}"
+_FACETS_TEMPLATE = "(site:kaggle.com/discussions OR site:kaggle.com/competitions OR site:kaggle.com/code) {}"
+_FACET_SOURCES = {  # URL prefix -> source label
+    "kaggle.com/discussions": "kaggle-discussion",
+    "kaggle.com/competitions": "kaggle-competition",
+    "kaggle.com/code": "kaggle-notebook",
+}
+
+
+def _facet_source(url: str) -> str | None:
+    """Return the source label of a Kaggle URL covered by the facet search, ignoring scheme and www.
+
+    Competition discussion threads (``kaggle.com/competitions/<slug>/discussion/<id>``) count as discussions.
+    """
+    path = url.split("://", 1)[-1].removeprefix("www.")
+    if path.startswith("kaggle.com/") and "/discussion/" in path:
+        return "kaggle-discussion"
+    return next((source for prefix, source in _FACET_SOURCES.items() if path.startswith(prefix)), None)
+
+
+def _has_kaggle_credentials() -> bool:
+    """Check for Kaggle credentials in the environment or config dir without importing the SDK."""
+    if os.environ.get("KAGGLE_API_TOKEN") or ("KAGGLE_USERNAME" in os.environ and "KAGGLE_KEY" in os.environ):
+        return True
+    config_dir = Path(os.environ.get("KAGGLE_CONFIG_DIR") or "~/.kaggle").expanduser()
+    return any((config_dir / name).is_file() for name in CREDENTIAL_FILES)
+
+
+class _SharedClient:
+    """Context manager handing out one long-lived KaggleClient without closing it on exit."""
+
+    def __init__(self, client: "KaggleClient") -> None:
+        self.client = client
+
+    def __enter__(self) -> "KaggleClient":
+        return self.client
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+@cache
+def _pooled_api_class() -> type["KaggleApi"]:
+    """Import the Kaggle SDK on first use and define a KaggleApi reusing one keep-alive HTTP session."""
+    from kaggle.api.kaggle_api_extended import KaggleApi
+    from requests.adapters import HTTPAdapter
+
+    class PooledKaggleApi(KaggleApi):
+        _shared: _SharedClient | None = None
+
+        def build_kaggle_client(self) -> _SharedClient:
+            if self._shared is None:
+                client = super().build_kaggle_client()
+                http_client = client.http_client()
+                http_client._init_session()
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    max_retries=http_retries(0.3),
+                )
+                http_client._session.mount("https://", adapter)
+                self._shared = _SharedClient(client)
+            return self._shared
+
+    return PooledKaggleApi
 
 
 class KaggleSearch:
     """Kaggle search using official API."""
 
-    def __init__(self) -> None:
-        """Initialize Kaggle API client."""
-        self.api = KaggleApi()
-        try:
-            self.api.authenticate()
-            self.authenticated = True
-        except Exception:
-            self.authenticated = False
+    def __init__(self, ddgs: "DDGS | None" = None) -> None:
+        """Initialize Kaggle API client, reusing ``ddgs`` for discussion search when given."""
+        if ddgs is None:
+            from duckduckgo_search import DDGS
 
-    def search_competitions(self, query: str, max_results: int = 5) -> list[dict[str, Any]]:
-        """Search Kaggle competitions."""
+            ddgs = DDGS()
+        self.ddgs = ddgs
+        self.api: "KaggleApi | None" = None
+        self.authenticated = False
+        if _has_kaggle_credentials():
+            self.api = _pooled_api_class()()
+            try:
+                self.api.authenticate()
+                self.api.build_kaggle_client()
+                self.authenticated = True
+            except (Exception, SystemExit):  # authenticate() calls exit() when no credential source works
+                self.authenticated = False
+        # KaggleApi is sync-only; a small dedicated pool keeps concurrent calls under its rate limits.
+        self.executor = ThreadPoolExecutor(max_workers=KAGGLE_WORKERS, thread_name_prefix="kaggle")
+
+    @ttl_cached
+    def search_competitions_json(self, query: str, max_results: int = 5) -> bytes:
+        """Search Kaggle competitions, returning the results as JSON bytes."""
         if not self.authenticated:
-            return []
+            return EMPTY_RESULTS
         try:
-            competitions = self.api.competitions_list(search=query)[:max_results]
-            return [
-                {
-                    "title": comp.title,
-                    "url": f"https://www.kaggle.com/competitions/{comp.ref}",
-                    "content": f"{comp.description or ''} | Deadline: {comp.deadline} | Reward: {comp.reward}",
-                }
+            competitions = guarded(kaggle_breaker, self.api.competitions_list, search=query)[:max_results]
+            return orjson.dumps([
+                SearchResult(
+                    title=comp.title,
+                    url=f"https://www.kaggle.com/competitions/{comp.ref}",
+                    content=f"{comp.description or ''} | Deadline: {comp.deadline} | Reward: {comp.reward}",
+                    source="kaggle-competition",
+                )
                 for comp in competitions
-            ]
+            ])
         except Exception:
-            return []
+            return EMPTY_RESULTS
 
-    def search_datasets(self, query: str, max_results: int = 5) -> list[dict[str, Any]]:
-        """Search Kaggle datasets."""
+    @ttl_cached
+    def search_datasets_json(self, query: str, max_results: int = 5) -> bytes:
+        """Search Kaggle datasets, returning the results as JSON bytes."""
         if not self.authenticated:
-            return []
+            return EMPTY_RESULTS
         try:
-            datasets = self.api.dataset_list(search=query, max_size=max_results)
-            return [
-                {
-                    "title": dataset.title,
-                    "url": f"https://www.kaggle.com/datasets/{dataset.ref}",
-                    "content": f"{dataset.subtitle or ''} | Size: {dataset.totalBytes} bytes | Downloads: {dataset.downloadCount}",
-                }
+            datasets = guarded(kaggle_breaker, self.api.dataset_list, search=query, max_size=max_results)
+            return orjson.dumps([
+                SearchResult(
+                    title=dataset.title,
+                    url=f"https://www.kaggle.com/datasets/{dataset.ref}",
+                    content=f"{dataset.subtitle or ''} | Size: {dataset.totalBytes} bytes | Downloads: {dataset.downloadCount}",
+                    source="kaggle-dataset",
+                )
                 for dataset in datasets[:max_results]
-            ]
+            ])
         except Exception:
-            return []
+            return EMPTY_RESULTS
 
-    def search_notebooks(self, query: str, max_results: int = 5) -> list[dict[str, Any]]:
-        """Search Kaggle notebooks (kernels)."""
+    @ttl_cached
+    def search_notebooks_json(self, query: str, max_results: int = 5) -> bytes:
+        """Search Kaggle notebooks (kernels), returning the results as JSON bytes."""
         if not self.authenticated:
-            return []
+            return EMPTY_RESULTS
         try:
-            kernels = self.api.kernels_list(search=query, page_size=max_results)
-            return [
-                {
-                    "title": kernel.title,
-                    "url": f"https://www.kaggle.com/code/{kernel.ref}",
-                    "content": f"Author: {kernel.author} | Votes: {kernel.totalVotes} | Language: {kernel.language}",
-                }
+            kernels = guarded(kaggle_breaker, self.api.kernels_list, search=query, page_size=max_results)
+            return orjson.dumps([
+                SearchResult(
+                    title=kernel.title,
+                    url=f"https://www.kaggle.com/code/{kernel.ref}",
+                    content=f"Author: {kernel.author} | Votes: {kernel.totalVotes} | Language: {kernel.language}",
+                    source="kaggle-notebook",
+                )
                 for kernel in kernels
-            ]
+            ])
         except Exception:
-            return []
+            return EMPTY_RESULTS
 
-    def search_discussions(self, query: str, max_results: int = 10) -> list[dict[str, Any]]:
-        """Search Kaggle discussions via web search."""
+    @ttl_cached
+    def search_discussions_json(self, query: str, max_results: int = 10) -> bytes:
+        """Search Kaggle discussions via web search, returning the results as JSON bytes."""
         try:
-            from duckduckgo_search import DDGS
+            search_query = _DISCUSSION_TEMPLATE.format(query)
+            results = guarded(ddg_breaker, self.ddgs.text, search_query, max_results=max_results)
+            return orjson.dumps([
+                SearchResult(title=r.get("title", ""), url=r.get("href", ""), content=r.get("body", ""), source="kaggle-discussion")
+                for r in results
+            ])
+        except Exception:
+            return EMPTY_RESULTS
 
-            ddgs = DDGS()
-            search_query = f"site:kaggle.com/discussions {query}"
-            results = ddgs.text(search_query, max_results=max_results)
-            return [{"title": r.get("title", ""), "url": r.get("href", ""), "content": r.get("body", "")} for r in results]
+    @ttl_cached
+    def search_site_facets_json(self, query: str, max_results: int = 10) -> bytes:
+        """Search Kaggle discussions, competitions and code in one web query, returning JSON bytes."""
+        try:
+            search_query = _FACETS_TEMPLATE.format(query)
+            results = guarded(ddg_breaker, self.ddgs.text, search_query, max_results=max_results)
+            return orjson.dumps([
+                SearchResult(title=r.get("title", ""), url=r.get("href", ""), content=r.get("body", ""), source=source)
+                for r in results
+                if (source := _facet_source(r.get("href", "")))
+            ])
         except Exception:
-            return []
+            return EMPTY_RESULTS
+
+    def search_competitions(self, query: str, max_results: int = 5) -> list[SearchResult]:
+        """Search Kaggle competitions."""
+        return load_results(self.search_competitions_json(query, max_results))
+
+    def search_datasets(self, query: str, max_results: int = 5) -> list[SearchResult]:
+        """Search Kaggle datasets."""
+        return load_results(self.search_datasets_json(query, max_results))
+
+    def search_notebooks(self, query: str, max_results: int = 5) -> list[SearchResult]:
+        """Search Kaggle notebooks (kernels)."""
+        return load_results(self.search_notebooks_json(query, max_results))
+
+    def search_discussions(self, query: str, max_results: int = 10) -> list[SearchResult]:
+        """Search Kaggle discussions via web search."""
+        return load_results(self.search_discussions_json(query, max_results))
+
+    def search_site_facets(self, query: str, max_results: int = 10) -> dict[str, list[SearchResult]]:
+        """Search Kaggle discussions, competitions and code with one OR'd site query, bucketed by source label."""
+        buckets: dict[str, list[SearchResult]] = {source: [] for source in _FACET_SOURCES.values()}
+        for result in load_results(self.search_site_facets_json(query, max_results)):
+            buckets[result.source].append(result)
+        return buckets
+
+    def search_all(self, query: str) -> dict[str, list[SearchResult]]:
+        """Search competitions, datasets, notebooks and discussions in parallel on the Kaggle thread pool."""
+        futures = {
+            "competitions": self.executor.submit(self.search_competitions, query),
+            "datasets": self.executor.submit(self.search_datasets, query),
+            "notebooks": self.executor.submit(self.search_notebooks, query),
+            "discussions": self.executor.submit(self.search_discussions, query),
+        }
+        return {facet: future.result() for facet, future in futures.items()}
+
+    async def _run_blocking(self, func: Callable[..., list[SearchResult]], *args: Any) -> list[SearchResult]:
+        """Run a blocking Kaggle call on the Kaggle thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args))
+
+    async def search_competitions_async(self, query: str, max_results: int = 5) -> list[SearchResult]:
+        """Search Kaggle competitions without blocking the event loop."""
+        return await self._run_blocking(self.search_competitions, query, max_results)
+
+    async def search_datasets_async(self, query: str, max_results: int = 5) -> list[SearchResult]:
+        """Search Kaggle datasets without blocking the event loop."""
+        return await self._run_blocking(self.search_datasets, query, max_results)
+
+    async def search_notebooks_async(self, query: str, max_results: int = 5) -> list[SearchResult]:
+        """Search Kaggle notebooks without blocking the event loop."""
+        return await self._run_blocking(self.search_notebooks, query, max_results)
+
+    async def search_discussions_async(self, query: str, max_results: int = 10) -> list[SearchResult]:
+        """Search Kaggle discussions without blocking the event loop."""
+        return await self._run_blocking(self.search_discussions, query, max_results)
@@ -0,0 +1,74 @@
+"""Retry and circuit-breaker policies for search providers."""
+
+from typing import Any, Callable, TypeVar
+
+from pybreaker import CircuitBreaker
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+T = TypeVar("T")
+
+BREAKER_FAIL_MAX = 5
+BREAKER_RESET_TIMEOUT = 60  # seconds before a half-open trial call
+
+# HTTP sessions mounted with this policy leave connection and read failures to ``guarded``
+# so there is a single retry layer; only throttling and server errors are retried by urllib3.
+RETRY_STATUSES = (429, 500, 502, 503)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Connection failures and timeouts are worth retrying; HTTP errors and rate limits are not."""
+    import requests
+    from duckduckgo_search.exceptions import TimeoutException
+
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout, TimeoutException))
+
+
+def _is_client_error(exc: BaseException) -> bool:
+    """Errors caused by the request itself (e.g. a 4xx for a malformed query) say nothing about the provider."""
+    import requests
+    from duckduckgo_search.exceptions import DuckDuckGoSearchException
+
+    if _is_transient(exc) or isinstance(exc, (requests.exceptions.RetryError, DuckDuckGoSearchException)):
+        return False
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    return status is None or (400 <= status < 500 and status != 429)
+
+
+def http_retries(backoff_factor: float) -> Any:
+    """urllib3 ``Retry`` policy for pooled sessions: status retries only, no connect/read retries."""
+    from urllib3.util.retry import Retry
+
+    return Retry(total=3, connect=0, read=0, backoff_factor=backoff_factor, status_forcelist=RETRY_STATUSES)
+
+
+def _breaker(name: str) -> CircuitBreaker:
+    return CircuitBreaker(
+        fail_max=BREAKER_FAIL_MAX, reset_timeout=BREAKER_RESET_TIMEOUT, exclude=[_is_client_error], name=name
+    )
+
+
+# One breaker per provider, shared by every method hitting it (DDG serves both web and discussion search).
+arxiv_breaker = _breaker("arxiv")
+ddg_breaker = _breaker("duckduckgo")
+kaggle_breaker = _breaker("kaggle")
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=0.2, max=2),
+    retry=retry_if_exception(_is_transient),
+    reraise=True,
+)
+def _with_retries(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    return func(*args, **kwargs)
+
+
+def guarded(breaker: CircuitBreaker, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Call ``func`` through ``breaker``, retrying transient errors before counting a failure.
+
+    While the breaker is open this raises ``pybreaker.CircuitBreakerError``
+    immediately instead of waiting on a dead endpoint. Client errors such as
+    a 4xx for a bad query propagate without counting towards opening it.
+    """
+    return breaker.call(_with_retries, func, *args, **kwargs)
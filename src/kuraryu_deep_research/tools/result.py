@@ -0,0 +1,26 @@
+"""Search result record shared by every search provider."""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+import orjson
+
+
+@dataclass(slots=True, frozen=True)
+class SearchResult:
+    """One search hit; provider-specific fields (authors, published date, ...) live in ``extra``."""
+
+    title: str
+    url: str
+    content: str
+    source: str
+    extra: dict[str, Any] | None = field(default=None, compare=False, hash=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Flatten into a plain dict with ``extra`` merged in."""
+        return {"title": self.title, "url": self.url, "content": self.content, "source": self.source, **(self.extra or {})}
+
+
+def load_results(data: bytes) -> list[SearchResult]:
+    """Rebuild results from the JSON bytes produced by ``orjson.dumps(list[SearchResult])``."""
+    return [SearchResult(**item) for item in orjson.loads(data)]
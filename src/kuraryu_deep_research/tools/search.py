@@ -1,11 +1,42 @@
 """Search tools for Deep Research Agent."""
 
-from typing import Any
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import cached_property, partial
+from typing import TYPE_CHECKING, Any, Callable, Iterator
 
-import arxiv
-from duckduckgo_search import DDGS
+import orjson
 
+from .cache import EMPTY_RESULTS, normalize_query, ttl_cached
 from .kaggle import KaggleSearch
+from .resilience import arxiv_breaker, ddg_breaker, guarded, http_retries
+from .result import SearchResult, load_results
+
+if TYPE_CHECKING:
+    import requests
+    from lxml import etree
+
+SEARCH_WORKERS = 16
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+ARXIV_PAGE_SIZE = 10
+ARXIV_TIMEOUT = 10
+ATOM_NS = {"a": "http://www.w3.org/2005/Atom"}
+
+
+def _parse_arxiv_entry(entry: "etree._Element") -> SearchResult:
+    """Convert an Atom ``<entry>`` from the arXiv API into a search result."""
+    published = entry.findtext("a:published", "", ATOM_NS)
+    return SearchResult(
+        title=" ".join(entry.findtext("a:title", "", ATOM_NS).split()),
+        url=entry.findtext("a:id", "", ATOM_NS),
+        content=entry.findtext("a:summary", "", ATOM_NS).strip(),
+        source="arxiv",
+        extra={
+            "authors": [author.findtext("a:name", "", ATOM_NS) for author in entry.findall("a:author", ATOM_NS)],
+            "published": datetime.fromisoformat(published).isoformat() if published else "",
+        },
+    )
 
 
 class SearchTools:
@@ -13,47 +44,149 @@ class SearchTools:
 
     def __init__(self) -> None:
         """Initialize search tools."""
+        from duckduckgo_search import DDGS
+
         self.ddgs = DDGS()
-        self.kaggle = KaggleSearch()
+        self.kaggle = KaggleSearch(ddgs=self.ddgs)
+        self.executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="search")
 
-    def search_arxiv(self, query: str, max_results: int = 5) -> list[dict[str, Any]]:
-        """Search arXiv for papers."""
+    @cached_property
+    def arxiv_session(self) -> "requests.Session":
+        """Keep-alive session for the arXiv API, built on first arXiv search."""
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_maxsize=SEARCH_WORKERS, max_retries=http_retries(0.5)))
+        return session
+
+    def _fetch_arxiv_page(self, params: dict[str, Any]) -> bytes:
+        """Fetch one raw Atom page from the arXiv API."""
+        response = self.arxiv_session.get(ARXIV_API_URL, params=params, timeout=ARXIV_TIMEOUT)
+        response.raise_for_status()
+        return response.content
+
+    def iter_arxiv(self, query: str, max_results: int = 5) -> Iterator[SearchResult]:
+        """Yield arXiv papers one at a time, fetching further pages only as the caller consumes them.
+
+        Network, breaker and parse errors propagate to the caller, possibly after some papers were yielded.
+        """
+        from lxml import etree
+
+        for start in range(0, max_results, ARXIV_PAGE_SIZE):
+            page_size = min(ARXIV_PAGE_SIZE, max_results - start)
+            params = {
+                "search_query": query,
+                "start": start,
+                "max_results": page_size,
+                "sortBy": "relevance",
+                "sortOrder": "descending",
+            }
+            page = guarded(arxiv_breaker, self._fetch_arxiv_page, params)
+            entries = etree.fromstring(page).findall("a:entry", ATOM_NS)
+            for entry in entries:
+                yield _parse_arxiv_entry(entry)
+            if len(entries) < page_size:
+                return
+
+    @ttl_cached
+    def search_arxiv_json(self, query: str, max_results: int = 5) -> bytes:
+        """Search arXiv for papers, returning the results as JSON bytes."""
         try:
-            client = arxiv.Client()
-            search = arxiv.Search(query=query, max_results=max_results, sort_by=arxiv.SortCriterion.Relevance)
-            return [
-                {
-                    "title": result.title,
-                    "authors": [author.name for author in result.authors],
-                    "summary": result.summary,
-                    "url": result.entry_id,
-                    "published": result.published.isoformat(),
-                }
-                for result in client.results(search)
-            ]
+            return orjson.dumps(list(self.iter_arxiv(query, max_results)))
         except Exception:
-            return []
+            # 途中のページで失敗した結果はTTLキャッシュに残さない
+            return EMPTY_RESULTS
 
-    def search_web(self, query: str, max_results: int = 5) -> list[dict[str, Any]]:
-        """Search web using DuckDuckGo."""
+    def search_arxiv(self, query: str, max_results: int = 5) -> list[SearchResult]:
+        """Search arXiv for papers."""
+        return load_results(self.search_arxiv_json(query, max_results))
+
+    @ttl_cached
+    def search_web_json(self, query: str, max_results: int = 5) -> bytes:
+        """Search web using DuckDuckGo, returning the results as JSON bytes."""
         try:
-            results = self.ddgs.text(query, max_results=max_results)
-            return [{"title": r.get("title", ""), "url": r.get("href", ""), "content": r.get("body", "")} for r in results]
+            results = guarded(ddg_breaker, self.ddgs.text, query, max_results=max_results)
+            return orjson.dumps(
+                [SearchResult(title=r.get("title", ""), url=r.get("href", ""), content=r.get("body", ""), source="web") for r in results]
+            )
         except Exception:
-            return []
+            return EMPTY_RESULTS
+
+    def search_web(self, query: str, max_results: int = 5) -> list[SearchResult]:
+        """Search web using DuckDuckGo."""
+        return load_results(self.search_web_json(query, max_results))
 
-    def search_kaggle_competitions(self, query: str) -> list[dict[str, Any]]:
+    def search_kaggle_competitions(self, query: str) -> list[SearchResult]:
         """Search Kaggle competitions."""
         return self.kaggle.search_competitions(query)
 
-    def search_kaggle_datasets(self, query: str) -> list[dict[str, Any]]:
+    def search_kaggle_datasets(self, query: str) -> list[SearchResult]:
         """Search Kaggle datasets."""
         return self.kaggle.search_datasets(query)
 
-    def search_kaggle_notebooks(self, query: str) -> list[dict[str, Any]]:
+    def search_kaggle_notebooks(self, query: str) -> list[SearchResult]:
         """Search Kaggle notebooks."""
         return self.kaggle.search_notebooks(query)
 
-    def search_kaggle_discussions(self, query: str) -> list[dict[str, Any]]:
+    def search_kaggle_discussions(self, query: str) -> list[SearchResult]:
         """Search Kaggle discussions."""
         return self.kaggle.search_discussions(query)
+
+    def search_kaggle_all(self, query: str) -> dict[str, list[SearchResult]]:
+        """Search every Kaggle facet in parallel."""
+        return self.kaggle.search_all(query)
+
+    async def _run_blocking(self, func: Callable[..., list[SearchResult]], *args: Any) -> list[SearchResult]:
+        """Run a blocking search call on the shared search thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args))
+
+    async def search_arxiv_async(self, query: str, max_results: int = 5) -> list[SearchResult]:
+        """Search arXiv for papers without blocking the event loop."""
+        return await self._run_blocking(self.search_arxiv, query, max_results)
+
+    async def search_web_async(self, query: str, max_results: int = 5) -> list[SearchResult]:
+        """Search web using DuckDuckGo without blocking the event loop."""
+        return await self._run_blocking(self.search_web, query, max_results)
+
+    async def search_kaggle_competitions_async(self, query: str) -> list[SearchResult]:
+        """Search Kaggle competitions without blocking the event loop."""
+        return await self.kaggle.search_competitions_async(query)
+
+    async def search_kaggle_datasets_async(self, query: str) -> list[SearchResult]:
+        """Search Kaggle datasets without blocking the event loop."""
+        return await self.kaggle.search_datasets_async(query)
+
+    async def search_kaggle_notebooks_async(self, query: str) -> list[SearchResult]:
+        """Search Kaggle notebooks without blocking the event loop."""
+        return await self.kaggle.search_notebooks_async(query)
+
+    async def search_kaggle_discussions_async(self, query: str) -> list[SearchResult]:
+        """Search Kaggle discussions without blocking the event loop."""
+        return await self.kaggle.search_discussions_async(query)
+
+    async def fan_out(self, query: str, max_results: int = 5) -> dict[str, list[SearchResult]]:
+        """Query every provider concurrently and return results keyed by source label."""
+        searches = {
+            "arxiv": self.search_arxiv_async(query, max_results),
+            "web": self.search_web_async(query, max_results),
+            "kaggle-competition": self.search_kaggle_competitions_async(query),
+            "kaggle-dataset": self.search_kaggle_datasets_async(query),
+            "kaggle-notebook": self.search_kaggle_notebooks_async(query),
+            "kaggle-discussion": self.search_kaggle_discussions_async(query),
+        }
+        results = await asyncio.gather(*searches.values())
+        return dict(zip(searches, results))
+
+    async def search_many(self, queries: list[str], max_results: int = 5) -> dict[str, dict[str, list[SearchResult]]]:
+        """Fan out each distinct query once and map every input query to its results.
+
+        Queries that differ only in case or whitespace are dispatched once.
+        """
+        unique: dict[str, str] = {}
+        for query in queries:
+            unique.setdefault(normalize_query(query), query)
+        results = await asyncio.gather(*(self.fan_out(query, max_results) for query in unique.values()))
+        by_key = dict(zip(unique, results))
+        return {query: by_key[normalize_query(query)] for query in queries}